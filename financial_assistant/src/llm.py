@@ -70,6 +70,22 @@ class SambaNovaLLM:
         assert isinstance(system_prompt, str), TypeError('System prompt must be a string.')
         self.system_prompt = system_prompt
 
+        # JSON output parser
+        function_calling_parser = JsonOutputParser()
+
+        # Prompt template for function calling, with the static tools schemas and format instructions bound once
+        function_calling_prompt = PromptTemplate(
+            template=FUNCTION_CALLING_PROMPT_TEMPLATE,
+            input_variables=['user_query'],
+            partial_variables={
+                'tools': self.tools_schemas,
+                'format_instructions': function_calling_parser.get_format_instructions(),
+            },
+        )
+
+        # Chain for function calling
+        self.chain_function_calling = function_calling_prompt | self.llm | function_calling_parser
+
     def get_llm_config_info(self, config_path: str) -> Any:
         """
         Loads the json config file.
@@ -239,23 +255,10 @@ class SambaNovaLLM:
         Returns:
             The relevant tool to be invoked based on the query.
         """
-        # JSON output parser
-        function_calling_parser = JsonOutputParser()
-
-        # Prompt template for function calling
-        function_calling_prompt = PromptTemplate(
-            template=FUNCTION_CALLING_PROMPT_TEMPLATE,
-            input_variables=['tools', 'user_query'],
-            partial_variables={'format_instructions': function_calling_parser.get_format_instructions()},
-        )
-
-        # Chain for function calling
-        chain_function_calling = function_calling_prompt | self.llm | function_calling_parser
-
         # Invoke the LLM to find the relevant tools
         for i in range(MAX_RETRIES):
             try:
-                invoked_tools = chain_function_calling.invoke({'tools': self.tools_schemas, 'user_query': query})
+                invoked_tools = self.chain_function_calling.invoke({'user_query': query})
                 assert invoked_tools is not None, f'Expected a tool to call.'
                 assert len(invoked_tools) == 1, f'Expected one tool, got {len(invoked_tools)}.'
                 break
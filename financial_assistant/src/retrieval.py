@@ -1,3 +1,4 @@
+import functools
 from typing import Any, Dict, List, Optional, Tuple
 
 import streamlit
@@ -76,21 +77,35 @@ def get_retrieval_config_info() -> Tuple[Any, Any]:
 def load_embedding_model(embedding_model_info: Dict[str, Any]) -> SentenceTransformerEmbeddings | Embeddings:
     """Load the embedding model following the config information."""
 
-    if embedding_model_info['type'] == 'cpu':
+    return _load_embedding_model(
+        embedding_model_info['type'],
+        embedding_model_info.get('batch_size'),
+        embedding_model_info.get('coe', False),
+        embedding_model_info.get('select_expert'),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _load_embedding_model(
+    model_type: str, batch_size: Optional[int], coe: bool, select_expert: Optional[str]
+) -> SentenceTransformerEmbeddings | Embeddings:
+    """Load the embedding model once per configuration, and reuse it for every subsequent retrieval."""
+
+    if model_type == 'cpu':
         embeddings_cpu = SentenceTransformerEmbeddings(model_name='paraphrase-mpnet-base-v2')
         return embeddings_cpu
-    elif embedding_model_info['type'] == 'sambastudio':
+    elif model_type == 'sambastudio':
         embeddings_sambastudio = APIGateway.load_embedding_model(
-            type=embedding_model_info['type'],
-            batch_size=embedding_model_info['batch_size'],
-            coe=embedding_model_info['coe'],
-            select_expert=embedding_model_info['select_expert'],
+            type=model_type,
+            batch_size=batch_size,
+            coe=coe,
+            select_expert=select_expert,
         )
         return embeddings_sambastudio
     else:
         raise ValueError(
             f'`config.rag["embedding_model"]["type"]` can only be `cpu` or `sambastudio. '
-            f'Got {embedding_model_info["type"]}.'
+            f'Got {model_type}.'
         )
 
 
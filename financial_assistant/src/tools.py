@@ -1,7 +1,9 @@
 import ast
 import datetime
+import functools
 import json
 import logging
+import threading
 import time
 from typing import Any, Callable, Dict, List, Optional, Protocol, TypeVar
 
@@ -53,6 +55,28 @@ def get_logger(logger_name: str = 'logger') -> logging.Logger:
 timing_logger = get_logger('timingLogger')
 logger = get_logger()
 
+# Semaphore bounding the number of concurrent Yahoo Finance requests across threads
+yfinance_semaphore = threading.Semaphore(YFINANCE_MAX_CONCURRENCY)
+
+
+def limit_yfinance_concurrency(func: F) -> Any:
+    """
+    Decorator to bound the number of concurrent calls to Yahoo Finance across threads.
+
+    Args:
+        func: The function to be decorated, which sends requests to Yahoo Finance.
+
+    Returns:
+        The wrapped function that returns the original function's return value.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with yfinance_semaphore:
+            return func(*args, **kwargs)
+
+    return wrapper
+
 
 class ConversationalResponse(BaseModel):
     """Model representing a conversational answer."""
@@ -107,6 +131,7 @@ def get_conversational_response(user_query: str, response_object: Any) -> Any:
     return response
 
 
+@limit_yfinance_concurrency
 def extract_yfinance_data(
     symbol: str, start_date: datetime.date, end_date: datetime.date
 ) -> Dict[str, pandas.DataFrame | Dict[Any, Any]]:
@@ -1,5 +1,7 @@
 import datetime
 import os
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 
 import pandas
@@ -23,6 +25,13 @@ load_dotenv(os.path.join(repo_dir, '.env'))
 
 logger = get_logger()
 
+# Text chunks and report dates of the most recently parsed filings, by filing parameters
+filing_chunks_cache: OrderedDict[Tuple[str, str, int, int, int], Tuple[Tuple[str, ...], datetime.datetime]] = (
+    OrderedDict()
+)
+# Lock guarding the cache of the parsed filings across threads
+filing_chunks_lock = threading.Lock()
+
 
 class SecEdgarFilingsInput(BaseModel):
     """Tool for retrieving a financial filing from SEC Edgar and then answering the original user question."""
@@ -166,7 +175,7 @@ def retrieve_filings(
 
 def parse_filings(
     downloader: Downloader, ticker_symbol: str, filing_type: str, filing_quarter: int, year: int, delta: int = 10
-) -> Tuple[str, str]:
+) -> Tuple[str, datetime.datetime]:
     """
     Search the filing, parse it, and save it.
 
@@ -185,6 +194,79 @@ def parse_filings(
             1. The filename of the relevant parsed filing.
             2. The report date of the relevant parsed filing.
     """
+    # Search, download, and split the filing
+    chunks, report_date = get_filing_chunks(downloader, ticker_symbol, filing_type, filing_quarter, year, delta)
+
+    # Save chunks to csv
+    df = pandas.DataFrame(list(chunks), columns=['text'])
+    filename = f"filing_id_{filing_type.replace('-', '')}_{filing_quarter}_" + f'{ticker_symbol}_{report_date.year}'
+    df.to_csv(os.path.join(streamlit.session_state.source_dir, f'{filename}.csv'), index=False)
+
+    return filename, report_date
+
+
+def get_filing_chunks(
+    downloader: Downloader, ticker_symbol: str, filing_type: str, filing_quarter: int, year: int, delta: int = 10
+) -> Tuple[Tuple[str, ...], datetime.datetime]:
+    """
+    Get the text chunks of the filing, reusing the chunks of the most recently parsed filings across sessions.
+
+    The cache is keyed by the filing parameters only, as the downloader carries the credentials of each session.
+
+    Args:
+        downloader: Downloader object to download the filings from SEC website, on a cache miss.
+        ticker_symbol: Ticker symbol of the company to be parsed.
+        filing_type: Filing type of the company to be parsed.
+        filing_quarter: Filing quarter of the company to be parsed.
+        year: Year of the company to be parsed.
+        delta: Maximum number of years to be searched.
+
+    Returns:
+        A tuple of the followimg pair:
+            1. The text chunks of the relevant filing.
+            2. The report date of the relevant filing.
+    """
+    key = (ticker_symbol, filing_type, filing_quarter, year, delta)
+
+    # Cache hit
+    with filing_chunks_lock:
+        if key in filing_chunks_cache:
+            filing_chunks_cache.move_to_end(key)
+            return filing_chunks_cache[key]
+
+    # Cache miss
+    filing_chunks = download_filing_chunks(downloader, ticker_symbol, filing_type, filing_quarter, year, delta)
+    with filing_chunks_lock:
+        filing_chunks_cache[key] = filing_chunks
+        # Evict the least recently used filing
+        if len(filing_chunks_cache) > FILING_CHUNKS_CACHE_SIZE:
+            filing_chunks_cache.popitem(last=False)
+
+    return filing_chunks
+
+
+def download_filing_chunks(
+    downloader: Downloader, ticker_symbol: str, filing_type: str, filing_quarter: int, year: int, delta: int = 10
+) -> Tuple[Tuple[str, ...], datetime.datetime]:
+    """
+    Search the filing, download it, and split its text into chunks.
+
+    Args:
+        downloader: Downloader object to download the filings from SEC website.
+        ticker_symbol: Ticker symbol of the company to be parsed.
+        filing_type: Filing type of the company to be parsed.
+        filing_quarter: Filing quarter of the company to be parsed.
+        year: Year of the company to be parsed.
+        delta: Maximum number of years to be searched.
+
+    Returns:
+        A tuple of the followimg pair:
+            1. The text chunks of the relevant filing.
+            2. The report date of the relevant filing.
+
+    Raises:
+        Exception: If no filing matches the given `filing_type`, `ticker_symbol`, `filing_quarter`, and `year`.
+    """
 
     # Extract the metadata of the filings
     metadatas = downloader.get_filing_metadatas(
@@ -192,7 +274,6 @@ def parse_filings(
     )
 
     # Extract the filing text
-    filename = None
     for metadata in metadatas:
         # Extract the filing date
         report_date = metadata.report_date
@@ -230,25 +311,13 @@ def parse_filings(
                 )
 
                 # Split the text into chunks
-                chunks = splitter.split_text(text)
-
-                # Save chunks to csv
-                df = pandas.DataFrame(chunks, columns=['text'])
-                filename = (
-                    f"filing_id_{filing_type.replace('-', '')}_{filing_quarter}_"
-                    + f'{ticker_symbol}_{report_date.date().year}'
-                )
-                df.to_csv(os.path.join(streamlit.session_state.source_dir, f'{filename}.csv'), index=False)
-                break
+                return tuple(splitter.split_text(text)), report_date
 
     # If neither the year nor the quarter match, raise an error
-    if filename is None or filename == '':
-        if filing_type == '10-K':
-            raise Exception(f'Filing document {filing_type} for {ticker_symbol} for the year {year} is not available')
-        else:
-            raise Exception(
-                f'Filing document {filing_type} for {ticker_symbol} for the quarter {filing_quarter} '
-                'of the year {date} is not available'
-            )
-
-    return filename, report_date
+    if filing_type == '10-K':
+        raise Exception(f'Filing document {filing_type} for {ticker_symbol} for the year {year} is not available')
+    else:
+        raise Exception(
+            f'Filing document {filing_type} for {ticker_symbol} for the quarter {filing_quarter} '
+            'of the year {date} is not available'
+        )
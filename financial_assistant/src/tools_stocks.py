@@ -1,4 +1,5 @@
 import datetime
+import threading
 from typing import Any, Dict, List, Optional
 
 import pandas
@@ -19,11 +20,15 @@ from financial_assistant.src.tools import (
     coerce_str_to_list,
     convert_data_to_frame,
     extract_yfinance_data,
+    limit_yfinance_concurrency,
     time_llm,
 )
 from financial_assistant.streamlit.constants import *
 from financial_assistant.streamlit.utilities_app import delete_temp_dir
 
+# Lock serializing the calls to `yfinance.download` across threads
+yfinance_download_lock = threading.Lock()
+
 
 class StockInfoSchema(BaseModel):
     """Tool for retrieving accurate stock information for a list of companies using the specified dataframe name."""
@@ -335,6 +340,7 @@ def get_historical_price(
     return fig, data_price, symbol_list
 
 
+@limit_yfinance_concurrency
 def download_data_history(
     symbol_list: List[str],
     quantity: str,
@@ -356,11 +362,32 @@ def download_data_history(
     # Initialise a pandas DataFrame with symbols as columns and dates as index
     data_price = pandas.DataFrame(columns=symbol_list)
 
-    # Fetch historical price data from Yahoo Finance
-    for symbol in symbol_list:
-        data = yfinance.Ticker(symbol)
-        data_history = data.history(start=start_date, end=end_date)
-        data_price[symbol] = data_history[quantity]
+    # Fetch historical price data from Yahoo Finance, with one request per batch of symbols
+    for batch_start in range(0, len(symbol_list), YFINANCE_BATCH_SIZE):
+        symbol_batch = symbol_list[batch_start : batch_start + YFINANCE_BATCH_SIZE]
+        # `yfinance.download` collects its results in a module-global dictionary, so it must not run concurrently
+        with yfinance_download_lock:
+            data_history = yfinance.download(
+                symbol_batch,
+                start=start_date,
+                end=end_date,
+                auto_adjust=True,
+                progress=False,
+            )[quantity]
+
+        # A single symbol yields a series instead of a dataframe with one column per symbol
+        if isinstance(data_history, pandas.Series):
+            data_history = data_history.to_frame(name=symbol_batch[0].upper())
+
+        # The index holds the local dates of the exchange, timezone-naive for a single symbol,
+        # and labelled as UTC without conversion for multiple symbols
+        if data_history.index.tz is not None:
+            data_history.index = data_history.index.tz_localize(None)
+        data_history.index = data_history.index.tz_localize(YFINANCE_TIMEZONE)
+
+        # `yfinance.download` upper-cases the symbols
+        for symbol in symbol_batch:
+            data_price[symbol] = data_history[symbol.upper()]
 
     return data_price
 
@@ -372,8 +399,9 @@ def plot_price_over_time(data_close: pandas.DataFrame) -> Figure:
     for column in data_close:
         full_df = full_df.merge(data_close[column], on='Date', how='outer')
 
-    # Create a matplotlib figure
-    fig, ax = pyplot.subplots(figsize=(12, 6))
+    # Create a matplotlib figure, detached from the `pyplot` global figure manager
+    fig = Figure(figsize=(12, 6), dpi=FIGURE_DPI)
+    ax = fig.subplots()
 
     # Dynamically plot each stock symbol in the DataFrame
     for column in full_df.columns[1:]:  # Skip the first column since it's the date
@@ -408,6 +436,6 @@ def plot_price_over_time(data_close: pandas.DataFrame) -> Figure:
     ax.legend(title='Stock Symbol', loc='upper left', bbox_to_anchor=(1, 1))
 
     # Adjust layout to prevent cutting off labels
-    pyplot.tight_layout()
+    fig.tight_layout()
 
     return fig
@@ -12,7 +12,7 @@ from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
 from financial_assistant.src.retrieval import get_qa_response
-from financial_assistant.src.tools import coerce_str_to_list, get_logger
+from financial_assistant.src.tools import coerce_str_to_list, get_logger, limit_yfinance_concurrency
 from financial_assistant.src.tools_stocks import retrieve_symbol_list
 from financial_assistant.streamlit.constants import *
 
@@ -79,6 +79,7 @@ def scrape_yahoo_finance_news(company_list: List[str] | str, user_query: str) ->
     return get_qa_response_from_news(streamlit.session_state.web_scraping_path, user_query)
 
 
+@limit_yfinance_concurrency
 def retrieve_text_yahoo_finance_news(link_urls: List[str]) -> None:
     """
     Scrapes news articles from Yahoo Finance for a given list of ticker symbols.
@@ -178,6 +179,7 @@ def retrieve_text_yahoo_finance_news(link_urls: List[str]) -> None:
     df_text_url.to_csv(streamlit.session_state.web_scraping_path, index=False)
 
 
+@limit_yfinance_concurrency
 def get_url_list(symbol_list: Optional[List[str]] = None) -> List[str]:
     """
     Get the most relevant urls from Yahoo Finance News for a given list of company ticker symbols.
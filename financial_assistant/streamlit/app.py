@@ -1,7 +1,8 @@
-import datetime
+import functools
 import os
 import sys
 import time
+from typing import Any, Callable, Dict
 
 import weave
 import yaml
@@ -10,49 +11,375 @@ import yaml
 current_dir = os.path.dirname(os.path.abspath(__file__))
 kit_dir = os.path.abspath(os.path.join(current_dir, '..'))
 repo_dir = os.path.abspath(os.path.join(kit_dir, '..'))
-sys.path.append(kit_dir)
-sys.path.append(repo_dir)
+# Streamlit re-executes this script on every rerun, so only extend `sys.path` once
+for path in (kit_dir, repo_dir):
+    if path not in sys.path:
+        sys.path.append(path)
 
 import streamlit
-from streamlit_extras.stylable_container import stylable_container
 
 from financial_assistant.src.tools import get_logger
-from financial_assistant.streamlit.app_financial_filings import include_financial_filings
-from financial_assistant.streamlit.app_pdf_report import include_pdf_report
-from financial_assistant.streamlit.app_stock_data import get_stock_data_analysis
-from financial_assistant.streamlit.app_stock_database import get_stock_database
-from financial_assistant.streamlit.app_yfinance_news import get_yfinance_news
 from financial_assistant.streamlit.constants import *
 from financial_assistant.streamlit.utilities_app import (
+    blue_button_container,
     clear_cache,
     create_temp_dir_with_subdirs,
     delete_all_subdirectories,
     display_directory_contents,
-    get_blue_button_style,
     initialize_session,
     schedule_temp_dir_deletion,
     set_css_styles,
     submit_sec_edgar_details,
 )
-from financial_assistant.streamlit.utilities_methods import stream_chat_history
 from utils.visual.env_utils import are_credentials_set, env_input_fields, save_credentials
 
-# Initialize Weave with your project name
-if os.getenv('WANDB_API_KEY') is not None:
+
+@streamlit.cache_resource
+def init_weave() -> None:
+    """Initialize Weave with your project name, once per process rather than on every Streamlit rerun."""
+
     weave.init('sambanova_financial_assistant')
 
+
+# Initialize Weave
+if os.getenv('WANDB_API_KEY') is not None:
+    init_weave()
+
+
+@streamlit.cache_resource
+def load_config(config_path: str) -> Any:
+    """
+    Load the YAML config file once per process, and reuse it across Streamlit reruns.
+
+    Args:
+        config_path: The path to the config file.
+
+    Returns:
+        The parsed config.
+    """
+    with open(config_path, 'r') as yaml_file:
+        # Use the libyaml C parser if available
+        return yaml.load(yaml_file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
 # Load the config
-with open(CONFIG_PATH, 'r') as yaml_file:
-    config = yaml.safe_load(yaml_file)
+config = load_config(CONFIG_PATH)
 # Get the production flag
 prod_mode = config['prod_mode']
 
 logger = get_logger()
 
+# Options of the navigation menu, interned so that they are compared by identity when dispatching the pages
+MENU_OPTIONS = tuple(
+    sys.intern(option)
+    for option in (
+        'Home',
+        'Stock Data Analysis',
+        'Stock Database',
+        'Financial News Scraping',
+        'Financial Filings Analysis',
+        'Generate PDF Report',
+        'Print Chat History',
+    )
+)
+
+# Header of the main page, with the SambaNova logo next to the title
+MAIN_PAGE_HEADER = (
+    '<div style="display: flex; align-items: center; gap: 1.5rem;">'
+    f'<img src="{SAMBANOVA_LOGO}" width="100">'
+    '<h1>SambaNova Financial Assistant</h1>'
+    '</div>'
+)
+
+# Welcome text of the Home page
+HOME_PAGE_MARKDOWN = """
+Welcome to SambaNova Financial Assistant.
+This app demonstrates the capabilities of large language models (LLMs)
+in extracting and analyzing financial data using function calling, web scraping,
+and retrieval-augmented generation (RAG).
+
+Use the navigation menu to explore various features including:
+
+- **Stock Data Analysis**: Query and analyze stocks based on Yahoo Finance data.
+- **Stock Database**: Create and query an SQL database based on Yahoo Finance data.
+- **Financial News Scraping**: Scrape financial news articles from Yahoo Finance News.
+- **Financial Filings Analysis**: Query and analyze financial filings based on SEC EDGAR data.
+- **Generate PDF Report**: Generate a PDF report based on the saved answered queries
+    or on the whole chat history.
+- **Print Chat History**: Print the whole chat history.
+"""
+
+
+def saved_files() -> None:
+    """Saved files section of the sidebar."""
+
+    streamlit.title('Saved Files')
+
+    # Custom button to clear all files
+    with blue_button_container():
+        if streamlit.button(
+            label='Clear All Files',
+            key='clear-button',
+            help='This will delete all saved files',
+        ):
+            try:
+                clear_cache(delete=False)
+                # List the main cache subdirectories
+                subdirectories = [
+                    streamlit.session_state.source_dir,
+                    streamlit.session_state.pdf_sources_directory,
+                    streamlit.session_state.pdf_generation_directory,
+                ]
+                delete_all_subdirectories(directory=streamlit.session_state.cache_dir, exclude=subdirectories)
+
+                streamlit.success('All files have been deleted.')
+            except:
+                pass
+
+    # Set the default path
+    cache_dir = streamlit.session_state.cache_dir
+    # Use Streamlit's session state to persist the current path
+    if 'current_path' not in streamlit.session_state:
+        streamlit.session_state.current_path = cache_dir
+
+    if os.path.exists(cache_dir):
+        # Input to allow user to go back to a parent directory, up to the cache, but not beyond the cache
+        if streamlit.button('⬅️ Back', key=f'back') and cache_dir in streamlit.session_state.current_path:
+            streamlit.session_state.current_path = os.path.dirname(streamlit.session_state.current_path)
+
+        # Display the current directory contents
+        display_directory_contents(streamlit.session_state.current_path, cache_dir)
+
+
+def exit_if_expired(page: Callable[[], None]) -> Callable[[], None]:
+    """
+    Decorator to rerun the whole app from a page once the session has expired.
+
+    The pages rerun on their own when the user interacts with them, so they must check the expiry themselves,
+    for the sidebar to then exit the app.
+
+    Args:
+        page: The page to be decorated, below its `streamlit.fragment` decorator.
+
+    Returns:
+        The wrapped page.
+    """
+
+    @functools.wraps(page)
+    def wrapper() -> None:
+        if streamlit.session_state.expired:
+            streamlit.rerun()
+        page()
+
+    return wrapper
+
+
+@streamlit.fragment
+@exit_if_expired
+def home_page() -> None:
+    """Home page."""
+
+    streamlit.title('Financial Insights with LLMs')
+
+    streamlit.markdown(HOME_PAGE_MARKDOWN)
+
+
+@streamlit.fragment
+@exit_if_expired
+def stock_data_analysis_page() -> None:
+    """Stock Data Analysis page."""
+
+    # Import the page lazily, to only load its dependencies when visited
+    from financial_assistant.streamlit.app_stock_data import get_stock_data_analysis
+
+    get_stock_data_analysis()
+
+
+@streamlit.fragment
+@exit_if_expired
+def stock_database_page() -> None:
+    """Stock Database page."""
+
+    # Import the page lazily, to only load its dependencies when visited
+    from financial_assistant.streamlit.app_stock_database import get_stock_database
+
+    get_stock_database()
+
+
+@streamlit.fragment
+@exit_if_expired
+def financial_news_page() -> None:
+    """Financial News Scraping page."""
+
+    # Import the page lazily, to only load its dependencies when visited
+    from financial_assistant.streamlit.app_yfinance_news import get_yfinance_news
+
+    get_yfinance_news()
+
+
+@streamlit.fragment
+@exit_if_expired
+def financial_filings_page() -> None:
+    """Financial Filings Analysis page."""
+
+    # Import the page lazily, to only load its dependencies when visited
+    from financial_assistant.streamlit.app_financial_filings import include_financial_filings
+
+    # Populate SEC-EDGAR credentials
+    submit_sec_edgar_details()
+    if streamlit.session_state.SEC_API_ORGANIZATION is not None and streamlit.session_state.SEC_API_EMAIL is not None:
+        include_financial_filings()
+
+
+@streamlit.fragment
+@exit_if_expired
+def pdf_report_page() -> None:
+    """Generate PDF Report page."""
+
+    # Import the page lazily, to only load its dependencies when visited
+    from financial_assistant.streamlit.app_pdf_report import include_pdf_report
+
+    include_pdf_report()
+
+
+@streamlit.fragment
+@exit_if_expired
+def chat_history_page() -> None:
+    """Print Chat History page."""
+
+    # Import the page lazily, to only load its dependencies when visited
+    from financial_assistant.streamlit.utilities_methods import stream_chat_history
+
+    # Custom button to clear chat history
+    with blue_button_container():
+        if streamlit.button('Clear Chat History'):
+            streamlit.session_state.chat_history.clear()
+            # Log message
+            streamlit.success(f'Cleared chat history.')
+
+    # Add button to stream chat history
+    if streamlit.button('Print Chat History'):
+        if len(streamlit.session_state.chat_history) == 0:
+            streamlit.warning('No chat history to show.')
+        else:
+            stream_chat_history()
+
+
+# Pages of the navigation menu, by menu option
+PAGE_HANDLERS: Dict[str, Callable[[], None]] = dict(
+    zip(
+        MENU_OPTIONS,
+        (
+            home_page,
+            stock_data_analysis_page,
+            stock_database_page,
+            financial_news_page,
+            financial_filings_page,
+            pdf_report_page,
+            chat_history_page,
+        ),
+        strict=True,
+    )
+)
+
+
+def flag_menu_change() -> None:
+    """Flag a change of the navigation menu, which the sidebar fragment turns into a full app rerun."""
+
+    streamlit.session_state.menu_changed = True
+
+
+def maybe_exit_app() -> None:
+    """
+    Custom button to exit the app in prod mode, also triggered when the session has expired.
+
+    This will clear the chat history, delete the cache and clear the SambaNova credentials.
+    """
+    if not prod_mode:
+        return
+
+    # Bind the session state locally
+    session_state = streamlit.session_state
+
+    with blue_button_container():
+        if streamlit.button('Exit App', help='This will delete the cache!') or session_state.expired:
+            # Crear the chat history
+            session_state.chat_history.clear()
+            # Delete the cache
+            clear_cache(delete=True)
+            session_state.cache_initialized = False
+            session_state.expired = False
+            # Clear the SambaNova credentials
+            save_credentials('', '', prod_mode)
+
+            streamlit.success(r':green[The chat history has been cleared.]')
+            streamlit.success(r':green[The cache has been deleted.]')
+            streamlit.success(r':orange[You have been logged out.]')
+            time.sleep(2)
+            streamlit.rerun()
+
+
+@streamlit.fragment
+def sidebar(credentials_set: bool) -> None:
+    """
+    Sidebar of the app, rerun on its own when the user interacts with it.
+
+    Changing the page in the navigation menu, saving or clearing the credentials, and exiting the app
+    rerun the whole app instead.
+
+    Args:
+        credentials_set: Whether the SambaNova credentials are set.
+    """
+    # Bind the session state locally
+    session_state = streamlit.session_state
+
+    if not credentials_set:
+        # Get the SambaNova API Key
+        streamlit.markdown('Get your SambaNova API key [here](https://cloud.sambanova.ai/apis)')
+        url, api_key = env_input_fields()
+        if streamlit.button('Save Credentials', key='save_credentials_sidebar'):
+            message = save_credentials(url, api_key, prod_mode)
+            streamlit.success(message)
+            streamlit.rerun()
+    else:
+        streamlit.success('Credentials are set')
+        with blue_button_container():
+            if streamlit.button('Clear Credentials', key='clear_credentials'):
+                save_credentials('', '', prod_mode)
+                streamlit.success(r':orange[You have been logged out.]')
+                time.sleep(2)
+                streamlit.rerun()
+
+    # Exit the app in prod mode, whether or not the credentials are set
+    maybe_exit_app()
+
+    # Nothing else to render without credentials
+    if not credentials_set:
+        return
+
+    # Navigation menu
+    streamlit.title('Navigation')
+    streamlit.radio(
+        'Go to',
+        MENU_OPTIONS,
+        key='menu',
+        on_change=flag_menu_change,
+    )
+
+    # Rerun the whole app to render the newly selected page
+    if session_state.pop('menu_changed', False):
+        streamlit.rerun()
+
+    # Add saved files
+    saved_files()
+
 
 def main() -> None:
+    # Bind the session state locally
+    session_state = streamlit.session_state
+
     # Initialize session
-    initialize_session(streamlit.session_state, prod_mode)
+    initialize_session(session_state, prod_mode)
 
     # Streamlit app setup
     streamlit.set_page_config(
@@ -71,213 +398,41 @@ def main() -> None:
         icon_image=SAMBANOVA_LOGO,
     )
 
+    # Check the credentials once per rerun
+    credentials_set = are_credentials_set()
+
+    # Create the cache and its main subdirectories, once per session
+    if credentials_set and not session_state.cache_initialized:
+        # List the main cache subdirectories
+        subdirectories = [
+            session_state.source_dir,
+            session_state.pdf_sources_directory,
+            session_state.pdf_generation_directory,
+        ]
+        create_temp_dir_with_subdirs(session_state.cache_dir, subdirectories)
+
+        # In production, schedule deletion after EXIT_TIME_DELTA minutes
+        if prod_mode:
+            try:
+                schedule_temp_dir_deletion(session_state.cache_dir, delay_minutes=EXIT_TIME_DELTA)
+            except (OSError, RuntimeError) as e:
+                logger.debug('Could not schedule deletion of cache directory: %s', e)
+
+        session_state.cache_initialized = True
+
     # Add sidebar
     with streamlit.sidebar:
-        if not are_credentials_set():
-            # Get the SambaNova API Key
-            streamlit.markdown('Get your SambaNova API key [here](https://cloud.sambanova.ai/apis)')
-            url, api_key = env_input_fields()
-            if streamlit.button('Save Credentials', key='save_credentials_sidebar'):
-                message = save_credentials(url, api_key, prod_mode)
-                streamlit.success(message)
-                streamlit.rerun()
-        else:
-            streamlit.success('Credentials are set')
-            with stylable_container(
-                key='blue-button',
-                css_styles=get_blue_button_style(),
-            ):
-                if streamlit.button('Clear Credentials', key='clear_credentials'):
-                    save_credentials('', '', prod_mode)
-                    streamlit.success(r':orange[You have been logged out.]')
-                    time.sleep(2)
-                    streamlit.rerun()
-
-        # Create the cache and its main subdirectories
-        if are_credentials_set() and not os.path.exists(streamlit.session_state.cache_dir):
-            # List the main cache subdirectories
-            subdirectories = [
-                streamlit.session_state.source_dir,
-                streamlit.session_state.pdf_sources_directory,
-                streamlit.session_state.pdf_generation_directory,
-            ]
-
-            if prod_mode:
-                # In production mode
-                create_temp_dir_with_subdirs(streamlit.session_state.cache_dir, subdirectories)
-
-                # In production, schedule deletion after EXIT_TIME_DELTA minutes
-                try:
-                    schedule_temp_dir_deletion(streamlit.session_state.cache_dir, delay_minutes=EXIT_TIME_DELTA)
-                except:
-                    logger.warning('Could not schedule deletion of cache directory.')
-
-            else:
-                # In development mode
-                create_temp_dir_with_subdirs(streamlit.session_state.cache_dir, subdirectories)
-
-        # Custom button to exit the app in prod mode
-        # This will clear the chat history, delete the cache and clear the SambaNova credentials
-        if prod_mode:
-            with stylable_container(
-                key='blue-button',
-                css_styles=get_blue_button_style(),
-            ):
-                time_delta = datetime.datetime.now() - streamlit.session_state.launch_time
-                if (
-                    streamlit.button('Exit App', help='This will delete the cache!')
-                    or time_delta.seconds / 30 > EXIT_TIME_DELTA
-                ):
-                    # Crear the chat history
-                    streamlit.session_state.chat_history = list()
-                    # Delete the cache
-                    clear_cache(delete=True)
-                    # Clear the SambaNova credentials
-                    save_credentials('', '', prod_mode)
-
-                    streamlit.success(r':green[The chat history has been cleared.]')
-                    streamlit.success(r':green[The cache has been deleted.]')
-                    streamlit.success(r':orange[You have been logged out.]')
-                    time.sleep(2)
-                    streamlit.rerun()
-                    return
-
-        if are_credentials_set():
-            # Navigation menu
-            streamlit.title('Navigation')
-            menu = streamlit.radio(
-                'Go to',
-                [
-                    'Home',
-                    'Stock Data Analysis',
-                    'Stock Database',
-                    'Financial News Scraping',
-                    'Financial Filings Analysis',
-                    'Generate PDF Report',
-                    'Print Chat History',
-                ],
-            )
-
-            # Add saved files
-            streamlit.title('Saved Files')
-
-            # Custom button to clear all files
-            with stylable_container(
-                key='blue-button',
-                css_styles=get_blue_button_style(),
-            ):
-                if streamlit.button(
-                    label='Clear All Files',
-                    key='clear-button',
-                    help='This will delete all saved files',
-                ):
-                    try:
-                        clear_cache(delete=False)
-                        # List the main cache subdirectories
-                        subdirectories = [
-                            streamlit.session_state.source_dir,
-                            streamlit.session_state.pdf_sources_directory,
-                            streamlit.session_state.pdf_generation_directory,
-                        ]
-                        delete_all_subdirectories(directory=streamlit.session_state.cache_dir, exclude=subdirectories)
-
-                        streamlit.sidebar.success('All files have been deleted.')
-                    except:
-                        pass
-
-            # Set the default path
-            cache_dir = streamlit.session_state.cache_dir
-            # Use Streamlit's session state to persist the current path
-            if 'current_path' not in streamlit.session_state:
-                streamlit.session_state.current_path = cache_dir
-
-            if os.path.exists(cache_dir):
-                # Input to allow user to go back to a parent directory, up to the cache, but not beyond the cache
-                if (
-                    streamlit.sidebar.button('⬅️ Back', key=f'back')
-                    and cache_dir in streamlit.session_state.current_path
-                ):
-                    streamlit.session_state.current_path = os.path.dirname(streamlit.session_state.current_path)
-
-                    # Display the current directory contents
-                    display_directory_contents(streamlit.session_state.current_path, cache_dir)
-                else:
-                    # Display the current directory contents
-                    display_directory_contents(streamlit.session_state.current_path, cache_dir)
+        sidebar(credentials_set)
 
     # Title of the main page
-    columns = streamlit.columns([0.15, 0.85], vertical_alignment='top')
-    columns[0].image(SAMBANOVA_LOGO, width=100)
-    columns[1].title('SambaNova Financial Assistant')
-
-    if are_credentials_set():
-        # Home page
-        if menu == 'Home':
-            streamlit.title('Financial Insights with LLMs')
-
-            streamlit.write(
-                """
-                    Welcome to SambaNova Financial Assistant.
-                    This app demonstrates the capabilities of large language models (LLMs)
-                    in extracting and analyzing financial data using function calling, web scraping,
-                    and retrieval-augmented generation (RAG).
-                    
-                    Use the navigation menu to explore various features including:
-                    
-                    - **Stock Data Analysis**: Query and analyze stocks based on Yahoo Finance data.
-                    - **Stock Database**: Create and query an SQL database based on Yahoo Finance data.
-                    - **Financial News Scraping**: Scrape financial news articles from Yahoo Finance News.
-                    - **Financial Filings Analysis**: Query and analyze financial filings based on SEC EDGAR data.
-                    - **Generate PDF Report**: Generate a PDF report based on the saved answered queries
-                        or on the whole chat history.
-                    - **Print Chat History**: Print the whole chat history.
-                """
-            )
-
-        # Stock Data Analysis page
-        elif menu == 'Stock Data Analysis':
-            get_stock_data_analysis()
-
-        # Stock Database page
-        elif menu == 'Stock Database':
-            get_stock_database()
-
-        # Financial News Scraping page
-        elif menu == 'Financial News Scraping':
-            get_yfinance_news()
-
-        # Financial Filings Analysis page
-        elif menu == 'Financial Filings Analysis':
-            # Populate SEC-EDGAR credentials
-            submit_sec_edgar_details()
-            if (
-                streamlit.session_state.SEC_API_ORGANIZATION is not None
-                and streamlit.session_state.SEC_API_EMAIL is not None
-            ):
-                include_financial_filings()
-
-        # Generate PDF Report page
-        elif menu == 'Generate PDF Report':
-            include_pdf_report()
-
-        # Print Chat History page
-        elif menu == 'Print Chat History':
-            # Custom button to clear chat history
-            with stylable_container(
-                key='blue-button',
-                css_styles=get_blue_button_style(),
-            ):
-                if streamlit.button('Clear Chat History'):
-                    streamlit.session_state.chat_history = list()
-                    # Log message
-                    streamlit.success(f'Cleared chat history.')
-
-            # Add button to stream chat history
-            if streamlit.button('Print Chat History'):
-                if len(streamlit.session_state.chat_history) == 0:
-                    streamlit.warning('No chat history to show.')
-                else:
-                    stream_chat_history()
+    streamlit.markdown(MAIN_PAGE_HEADER, unsafe_allow_html=True)
+
+    # Nothing else to render without credentials
+    if not credentials_set:
+        return
+
+    # Render the page selected in the navigation menu
+    PAGE_HANDLERS.get(session_state.menu, home_page)()
 
 
 if __name__ == '__main__':
@@ -121,7 +121,7 @@ def include_pdf_report() -> None:
         help='This will take longer!',
     )
     if include_summary:
-        streamlit.write(r':red[Warning: This will take longer!]')
+        streamlit.markdown(r':red[Warning: This will take longer!]')
 
     # Generate the report
     if streamlit.button('Generate Report'):
@@ -146,7 +146,7 @@ def include_pdf_report() -> None:
                     file_name=report_name,
                     mime='application/pdf',
                 )
-                streamlit.write('PDF report generated successfully.')
+                streamlit.markdown('PDF report generated successfully.')
 
     # Use PDF report for RAG
     streamlit.markdown('<h2> Use PDF Report for RAG </h2>', unsafe_allow_html=True)
@@ -197,7 +197,7 @@ def include_pdf_report() -> None:
                             args=(file,),
                         ):
                             pass
-                streamlit.write(f"Selected files: :green[{', '.join(streamlit.session_state.selected_files)}]")
+                streamlit.markdown(f"Selected files: :green[{', '.join(streamlit.session_state.selected_files)}]")
 
         elif upload_your_pdf and not use_generated_pdf:
             # Add a PDF document for RAG
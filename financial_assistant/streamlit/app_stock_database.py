@@ -38,7 +38,7 @@ def get_stock_database() -> None:
 
     streamlit.markdown('<br><br>', unsafe_allow_html=True)
     streamlit.markdown('<h3> Query database </h3>', unsafe_allow_html=True)
-    streamlit.write(r':red[NB: Before querying the database for one company, you need to create it!]')
+    streamlit.markdown(r':red[NB: Before querying the database for one company, you need to create it!]')
     help_query_method = (
         'text-to-SQL will generate SQL queries,'
         '\nwhereas PandasAI-SqliteConnector will use pandasai to query the database.'
@@ -25,6 +25,8 @@ CHUNK_OVERLAP = 256
 RETRIEVE_HEADLINES = False
 TOP_K = 10
 MAX_URLS = 1000
+# Maximum number of parsed filings kept in memory
+FILING_CHUNKS_CACHE_SIZE = 32
 
 # SambaNova
 SAMBANOVA_LOGO = 'https://sambanova.ai/hubfs/logotype_sambanova_orange.png'
@@ -35,6 +37,14 @@ MAX_RETRIES = 3
 
 # STOCK INFO
 YFINANCE_COLUMNS_JSON = os.path.join(kit_dir, 'streamlit/yfinance_columns.json')
+# Maximum number of ticker symbols per Yahoo Finance request
+YFINANCE_BATCH_SIZE = 50
+# Maximum number of concurrent Yahoo Finance requests
+YFINANCE_MAX_CONCURRENCY = 4
+# Timezone of the Yahoo Finance price history
+YFINANCE_TIMEZONE = 'America/New_York'
+# Resolution of the saved stock price figures
+FIGURE_DPI = 100
 
 # Define default values for text inputs
 DEFAULT_COMPANY_NAME = 'Meta'
@@ -55,3 +65,11 @@ DEFAULT_PDF_TITLE = 'Financial Report'
 # Unit tests
 TEST_DIR = os.path.join(kit_dir, 'tests/')
 TEST_CACHE_DIR = os.path.join(TEST_DIR, 'cache/')
+TEST_STOCK_DB_LOCK_PATH = os.path.join(TEST_CACHE_DIR, 'stock_db.lock')
+# Persistent test caches, kept outside of the test cache directory which is deleted after every run
+TEST_PERSISTENT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache/financial_assistant_tests/')
+TEST_LLM_CACHE_PATH = os.path.join(TEST_PERSISTENT_CACHE_DIR, 'llm_cache.json')
+TEST_EDGAR_CACHE_DIR = os.path.join(TEST_PERSISTENT_CACHE_DIR, 'edgar/')
+TEST_HTTP_CACHE_PATH = os.path.join(TEST_PERSISTENT_CACHE_DIR, 'http_cache')
+# Seconds before the cached HTTP responses expire
+TEST_HTTP_CACHE_EXPIRE_AFTER = 86400
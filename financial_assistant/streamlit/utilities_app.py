@@ -1,4 +1,3 @@
-import datetime
 import json
 import os
 import re
@@ -15,7 +14,9 @@ import schedule
 import streamlit
 import yaml
 from matplotlib.figure import Figure
+from streamlit.delta_generator import DeltaGenerator
 from streamlit.elements.widgets.time_widgets import DateWidgetReturn
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 from financial_assistant.src.tools import get_logger
 from financial_assistant.streamlit.constants import *
@@ -75,17 +76,14 @@ def initialize_session(
     # Initialize credentials
     initialize_env_variables(prod_mode)
 
-    # Initialize SEC EDGAR credentials
-    if 'SEC_API_ORGANIZATION' not in streamlit.session_state:
+    # Initialize SEC EDGAR credentials, from the environment or from their defaults in production mode
+    if 'SEC_API_ORGANIZATION' not in session_state:
+        session_state.SEC_API_ORGANIZATION = 'SambaNova' if prod_mode else os.getenv('SEC_API_ORGANIZATION')
+    if 'SEC_API_EMAIL' not in session_state:
         if prod_mode:
-            streamlit.session_state.SEC_API_ORGANIZATION = 'SambaNova'
+            session_state.SEC_API_EMAIL = f'user_{session_state.session_id}@sambanova_cloud.com'
         else:
-            streamlit.session_state.SEC_API_ORGANIZATION = os.getenv('SEC_API_ORGANIZATION')
-    if 'SEC_API_EMAIL' not in streamlit.session_state:
-        if prod_mode:
-            streamlit.session_state.SEC_API_EMAIL = f'user_{session_state.session_id}@sambanova_cloud.com'
-        else:
-            streamlit.session_state.SEC_API_EMAIL = os.getenv('SEC_API_EMAIL')
+            session_state.SEC_API_EMAIL = os.getenv('SEC_API_EMAIL')
 
     # Initialize the chat history
     if 'chat_history' not in session_state:
@@ -102,6 +100,14 @@ def initialize_session(
         if 'cache_dir' not in session_state:
             session_state.cache_dir = cache_dir
 
+    # Whether the session has expired, after the scheduled deletion of its cache
+    if 'expired' not in session_state:
+        session_state.expired = False
+
+    # Whether the cache directories have been created for this session
+    if 'cache_initialized' not in session_state:
+        session_state.cache_initialized = False
+
     # Main cache directories
     if 'history_path' not in session_state:
         session_state.history_path = os.path.join(session_state.cache_dir, 'chat_history.txt')
@@ -142,10 +148,6 @@ def initialize_session(
     if 'db_query_figures_dir' not in session_state:
         session_state.db_query_figures_dir = os.path.join(session_state.cache_dir, 'db_query_figures')
 
-    # Launch time
-    if 'launch_time' not in session_state:
-        session_state.launch_time = datetime.datetime.now()
-
     # Clear pandasai cache
     if 'pandasai_cache' not in session_state:
         session_state.pandasai_cache = os.path.join(os.getcwd(), 'cache')
@@ -216,7 +218,7 @@ def save_historical_price_callback(
     data.to_csv(path_csv, index=True)
 
     # Save the plots as png images
-    fig.savefig(path_png, bbox_inches='tight')
+    fig.savefig(path_png, dpi=FIGURE_DPI, bbox_inches='tight')
 
     # Compose the content including the user query and the filename
     content = '\n\n' + user_query + '\n\n' + f'{path_png}' + '\n\n'
@@ -366,7 +368,8 @@ def dump_stripped_json(data: Any, indent: int = 2) -> str:
 
 def list_files_in_directory(directory: str) -> List[str]:
     """List all files in the given directory."""
-    return [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
+    with os.scandir(directory) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
 
 
 def list_directory(directory: str) -> Tuple[List[str], List[str]]:
@@ -379,30 +382,46 @@ def list_directory(directory: str) -> Tuple[List[str], List[str]]:
     elif os.getcwd() == kit_dir:
         os.chdir(os.path.realpath(os.path.dirname(os.getcwd())))
 
-    for name in os.listdir(directory):
-        path = os.path.join(directory, name)
-        if os.path.isdir(path):
-            subdirectories.append(name)
-        else:
-            files.append(name)
+    # The directory entries carry their file type, which spares a stat call per entry
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirectories.append(entry.name)
+            else:
+                files.append(entry.name)
     return subdirectories, files
 
 
+@streamlit.cache_data(ttl=5)
+def _list_directory_cached(directory: str, mtime_ns: int) -> Tuple[List[str], List[str]]:
+    """
+    List subdirectories and files in the given directory, cached until the directory changes.
+
+    Args:
+        directory: The directory to list.
+        mtime_ns: The modification time of the directory in nanoseconds, which invalidates the cache when it changes.
+
+    Returns:
+        A tuple of the list of subdirectories and the list of files.
+    """
+    return list_directory(directory)
+
+
 def display_directory_contents(path: str, default_path: str) -> None:
     """Display subdirectories and files in the current path."""
 
-    subdirectories, files = list_directory(path)
+    subdirectories, files = _list_directory_cached(path, os.stat(path).st_mtime_ns)
 
     dir_name = Path(path).name
     if dir_name.startswith('cache'):
         dir_name = 'cache'
 
-    streamlit.sidebar.markdown(f'### Directory: {dir_name}')
+    streamlit.markdown(f'### Directory: {dir_name}')
 
     if subdirectories:
-        streamlit.sidebar.markdown('#### Subdirectories:')
+        streamlit.markdown('#### Subdirectories:')
         for idx, subdir in enumerate(subdirectories):
-            if streamlit.sidebar.button(f'📁 {subdir}', key=f'{subdir}_{idx}'):
+            if streamlit.button(f'📁 {subdir}', key=f'{subdir}_{idx}'):
                 streamlit.session_state.current_path = os.path.join(streamlit.session_state.current_path, subdir)
 
                 files_subdir = list_files_in_directory(os.path.join(path, subdir))
@@ -410,12 +429,12 @@ def display_directory_contents(path: str, default_path: str) -> None:
                     download_file(streamlit.session_state.current_path + '/' + file)
 
     if files:
-        streamlit.sidebar.markdown('#### Files:')
+        streamlit.markdown('#### Files:')
         for file in files:
             download_file(path + '/' + file)
 
     if len(subdirectories + files) == 0:
-        streamlit.write('No files found')
+        streamlit.markdown('No files found')
 
     return
 
@@ -428,18 +447,20 @@ def clear_directory(directory: str, delete_subdirectories: bool = False) -> None
             logger.warning(f'Directory does not exist: {directory}')
             return
 
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
-            try:
-                if os.path.isfile(item_path):
-                    os.unlink(item_path)
-                elif os.path.isdir(item_path):
-                    # Recurse into subdirectory
-                    clear_directory(item_path, delete_subdirectories)
-                    if delete_subdirectories:
-                        shutil.rmtree(item_path)
-            except Exception as e:
-                logger.warning(f'Error deleting {item_path}: {e}')
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if delete_subdirectories:
+                            # Delete the whole subdirectory tree at once
+                            shutil.rmtree(entry.path)
+                        else:
+                            # Recurse into subdirectory
+                            clear_directory(entry.path, delete_subdirectories)
+                    else:
+                        os.unlink(entry.path)
+                except Exception as e:
+                    logger.warning(f'Error deleting {entry.path}: {e}')
     except Exception as e:
         logger.warning(f'Error processing directory {directory}: {e}')
 
@@ -447,27 +468,24 @@ def clear_directory(directory: str, delete_subdirectories: bool = False) -> None
 def clear_cache(delete: bool = False, verbose: bool = False) -> None:
     """Clear and/or delete the cache."""
 
-    try:
-        cache_dir = streamlit.session_state.cache_dir
+    cache_dir = streamlit.session_state.cache_dir
 
-        if not os.path.exists(cache_dir):
-            if verbose:
-                logger.warning(f'Cache directory does not exist: {Path(cache_dir).name}')
-            return
-
-        # Clear the cache directory recursively
-        clear_directory(cache_dir, delete)
-
-    except Exception as e:
-        logger.warning(f'Error clearing cache directory {Path(cache_dir).name}: {e}')
+    if not os.path.exists(cache_dir):
+        if verbose:
+            logger.warning(f'Cache directory does not exist: {Path(cache_dir).name}')
+        return
 
     if delete:
+        # Delete the whole cache directory tree at once, without clearing it first
         try:
             shutil.rmtree(cache_dir)
             if verbose:
                 logger.info(f'Successfully deleted cache directory: {Path(cache_dir).name}')
         except Exception as e:
             logger.warning(f'Error deleting cache directory {Path(cache_dir).name}: {e}')
+    else:
+        # Clear the cache directory recursively, keeping its subdirectories
+        clear_directory(cache_dir)
 
 
 def download_file(filename: str) -> None:
@@ -490,7 +508,7 @@ def download_file(filename: str) -> None:
     try:
         with open(filename, 'rb') as f:
             data = f.read()
-        streamlit.sidebar.download_button(
+        streamlit.download_button(
             label=Path(filename).name,
             data=data,
             file_name=Path(filename).name,
@@ -524,9 +542,22 @@ def delete_temp_dir(temp_dir: str, verbose: bool = False) -> None:
 
 
 def schedule_temp_dir_deletion(temp_dir: str, delay_minutes: int) -> None:
-    """Schedule the deletion of the temporary directory after a delay."""
+    """Schedule the deletion of the temporary directory after a delay, and flag the session as expired."""
+
+    # Capture the session state of the current session,
+    # as the job may run on the scheduler thread of another session
+    script_run_ctx = get_script_run_ctx()
+    if script_run_ctx is None:
+        raise RuntimeError('The deletion of the temporary directory can only be scheduled from a Streamlit session.')
+    session_state = script_run_ctx.session_state
+
+    def expire_session() -> Any:
+        delete_temp_dir(temp_dir=temp_dir, verbose=False)
+        session_state['expired'] = True
+        # Run the job only once
+        return schedule.CancelJob
 
-    schedule.every(delay_minutes).minutes.do(delete_temp_dir, temp_dir=temp_dir, verbose=False).tag(temp_dir)
+    schedule.every(delay_minutes).minutes.do(expire_session).tag(temp_dir)
 
     def run_scheduler() -> None:
         while schedule.get_jobs(temp_dir):
@@ -603,6 +634,20 @@ def set_css_styles() -> None:
             background-color: #45a049;
         }
 
+        /* Blue button styling, for the buttons of the containers marked by `blue_button_container` */
+        div[data-testid="stVerticalBlock"]:has(
+            > div.element-container > div.stMarkdown > div[data-testid="stMarkdownContainer"] > p > span.blue-button
+        ) button {
+            background-color: #2C3E50;
+            color: white;
+            padding: 0.75em 1.5em;
+            font-size: 1;
+            border: none;
+            border-radius: 5px;
+            cursor: pointer;
+            transition: background-color 0.3s ease;
+        }
+
         /* Radio button styling */
         .stRadio > label {
             font-size: 1;
@@ -659,16 +704,10 @@ def set_css_styles() -> None:
     )
 
 
-def get_blue_button_style() -> str:
-    """Get the CSS style for a blue button."""
-    return """
-        button {
-            background-color: #2C3E50;
-            color: white;
-            padding: 0.75em 1.5em;
-            font-size: 1;
-            border: none;
-            border-radius: 5px;
-            cursor: pointer;
-            transition: background-color 0.3s ease;
-        }"""
+def blue_button_container() -> DeltaGenerator:
+    """Get a container whose buttons are styled as blue buttons by `set_css_styles`."""
+
+    container = streamlit.container()
+    # Mark the container, for the blue button CSS rule to select it
+    container.markdown('<span class="blue-button"></span>', unsafe_allow_html=True)
+    return container
@@ -10,16 +10,38 @@ Returns:
     0 if all tests pass, or a positive integer representing the number of failed tests.
 """
 
+import copy
+import datetime
+import functools
+import hashlib
+import json
 import os
+import random
+import shutil
 import sys
+import threading
 import time
 import unittest
-from typing import Any, Dict, List, Tuple, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypedDict, TypeVar
+from unittest import mock
 
+import matplotlib
+import numpy
 import pandas
+import requests_cache
 import streamlit
+from filelock import FileLock
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.outputs import Generation
+from langchain_core.runnables import RunnableLambda, RunnableParallel
 from matplotlib.figure import Figure
 
+# Render the figures with the non-interactive backend
+matplotlib.use('Agg')
+
 # Main directories
 current_dir = os.path.dirname(os.path.abspath(__file__))
 kit_dir = os.path.abspath(os.path.join(current_dir, '..'))
@@ -27,10 +49,11 @@ repo_dir = os.path.abspath(os.path.join(kit_dir, '..'))
 sys.path.append(kit_dir)
 sys.path.append(repo_dir)
 
+from financial_assistant.src import tools_filings
 from financial_assistant.src.llm import SambaNovaLLM
-from financial_assistant.src.tools import get_logger
+from financial_assistant.src.tools import coerce_str_to_list, get_logger
 from financial_assistant.src.tools_database import create_stock_database, query_stock_database
-from financial_assistant.src.tools_filings import retrieve_filings
+from financial_assistant.src.tools_filings import parse_filings, retrieve_filings
 from financial_assistant.src.tools_pdf_generation import pdf_rag
 from financial_assistant.src.tools_stocks import get_historical_price, get_stock_info
 from financial_assistant.src.tools_yahoo_news import scrape_yahoo_finance_news
@@ -54,25 +77,265 @@ logger = get_logger()
 # Declare the type of the test class
 T = TypeVar('T', bound='FinancialAssistantTest')
 
-# Wait time for test retries in seconds
+# Maximum wait time for test retries in seconds
 RETRY_SLEEP_TIME = 30
 
+# Maximum random jitter added to the wait time for test retries in seconds
+RETRY_JITTER = 0.5
+
+# Maximum number of groups of tests running concurrently
+MAX_TEST_WORKERS = 8
+
+# Lock serializing the tests that swap the shared `streamlit.session_state.llm`
+llm_lock = threading.RLock()
+
+# Maximum number of readiness probes of the LLM before running the tests
+LLM_READINESS_ATTEMPTS = 10
+
+# Id of the running test, which LangChain carries into the worker threads of its chains
+running_test_id: ContextVar[Optional[str]] = ContextVar('running_test_id', default=None)
+
+
+class JSONLLMCache(BaseCache):
+    """
+    Content-addressed LLM cache persisted to a single JSON file.
+
+    The cache is installed globally via `langchain_core.globals.set_llm_cache`,
+    so that every LLM call issued by the tools and the `handle_*` methods is short-circuited,
+    regardless of the `SambaNovaLLM` instance that `streamlit.session_state.llm` points to.
+
+    The generations are kept pending, per test, until `commit` is called once the test that recorded them has passed.
+    Pending generations are neither looked up nor persisted,
+    so that the output of a failed test is queried again on retry instead of being replayed.
+    """
+
+    def __init__(self, cache_path: str, temperature: float = 0.0) -> None:
+        """
+        Args:
+            cache_path: The path to the JSON file backing the cache.
+            temperature: The temperature of the LLM. Caching is skipped for non-deterministic sampling.
+        """
+        self.cache_path = cache_path
+        self.temperature = temperature
+        self._cache: Dict[str, List[Dict[str, Any]]] = dict()
+
+        # Generations pending the success of their test, by test id
+        self._pending: Dict[Optional[str], Dict[str, List[Dict[str, Any]]]] = dict()
+        self._lock = threading.Lock()
+
+        # Load the cache from disk, if available
+        if os.path.isfile(cache_path):
+            try:
+                with open(cache_path, 'r') as cache_file:
+                    self._cache = json.load(cache_file)
+            except (OSError, json.JSONDecodeError):
+                logger.warning(f'Could not load the LLM cache from {cache_path}.')
+
+    @staticmethod
+    def cache_key(prompt: str, llm_string: str) -> str:
+        """Compute the cache key from the prompt and the serialized LLM parameters."""
+
+        payload = {'prompt': prompt, 'llm_string': llm_string}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up the committed generations for the given prompt and LLM parameters."""
+
+        if self.temperature > 0:
+            return None
+
+        with self._lock:
+            generations = self._cache.get(self.cache_key(prompt, llm_string))
+        if generations is None:
+            return None
+
+        return [Generation(**generation) for generation in generations]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations for the given prompt and LLM parameters, pending the success of the running test."""
+
+        if self.temperature > 0:
+            return
+
+        generations = [
+            {'text': generation.text, 'generation_info': generation.generation_info} for generation in return_val
+        ]
+        with self._lock:
+            self._pending.setdefault(running_test_id.get(), dict())[self.cache_key(prompt, llm_string)] = generations
+
+    def commit(self) -> None:
+        """Commit the generations stored by the running test, once it has passed."""
+
+        with self._lock:
+            self._cache.update(self._pending.pop(running_test_id.get(), dict()))
+
+    def discard(self) -> None:
+        """Discard the generations stored by a previous attempt of the running test."""
+
+        with self._lock:
+            self._pending.pop(running_test_id.get(), None)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Clear the in-memory cache."""
+
+        with self._lock:
+            self._cache = dict()
+            self._pending = dict()
+
+    def flush(self) -> None:
+        """Write the committed generations to disk."""
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with self._lock, open(self.cache_path, 'w') as cache_file:
+            json.dump(self._cache, cache_file)
+
+
+def cached_parse_filings(
+    downloader: Any, ticker_symbol: str, filing_type: str, filing_quarter: int, year: int, delta: int = 10
+) -> Tuple[str, Any]:
+    """
+    Disk-cached version of `parse_filings`, keyed by ticker symbol, filing type, filing quarter, and year.
+
+    The parsed filing is saved under `TEST_EDGAR_CACHE_DIR`,
+    and it is copied back to the sources directory on a cache hit instead of being downloaded from SEC EDGAR again.
+    """
+    metadata_path = os.path.join(TEST_EDGAR_CACHE_DIR, f'{ticker_symbol}_{filing_type}_{filing_quarter}_{year}.json')
+
+    # Cache hit
+    if os.path.isfile(metadata_path):
+        with open(metadata_path, 'r') as metadata_file:
+            metadata = json.load(metadata_file)
+        filename = metadata['filename']
+        shutil.copy(
+            os.path.join(TEST_EDGAR_CACHE_DIR, f'{filename}.csv'),
+            os.path.join(streamlit.session_state.source_dir, f'{filename}.csv'),
+        )
+        return filename, datetime.datetime.fromisoformat(metadata['report_date'])
+
+    # Cache miss
+    filename, report_date = parse_filings(downloader, ticker_symbol, filing_type, filing_quarter, year, delta)
+    os.makedirs(TEST_EDGAR_CACHE_DIR, exist_ok=True)
+    shutil.copy(
+        os.path.join(streamlit.session_state.source_dir, f'{filename}.csv'),
+        os.path.join(TEST_EDGAR_CACHE_DIR, f'{filename}.csv'),
+    )
+    with open(metadata_path, 'w') as metadata_file:
+        json.dump({'filename': filename, 'report_date': report_date.isoformat()}, metadata_file)
+
+    return filename, report_date
+
+
+# Responses of the tool `get_stock_info`, keyed by user query, company list, and dataframe name
+stock_info_responses: Dict[Tuple[str, Tuple[str, ...], Optional[str]], Dict[str, str]] = dict()
+# The original function of the tool `get_stock_info`
+get_stock_info_func: Callable[..., Dict[str, str]] = get_stock_info.func  # type: ignore[assignment]
+
+
+def cached_get_stock_info(
+    user_query: str, company_list: List[str] | str, dataframe_name: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Version of the tool `get_stock_info` that reuses the response of an equivalent previous invocation.
+
+    The response of `test_get_stock_info` is thus reused by `test_handle_stock_query`
+    whenever the LLM calls the tool with the same arguments, skipping the LLM calls of the tool itself.
+    """
+    key = (
+        ' '.join(user_query.lower().split()),
+        tuple(sorted(company.upper() for company in coerce_str_to_list(company_list))),
+        dataframe_name,
+    )
+    if key not in stock_info_responses:
+        stock_info_responses[key] = get_stock_info_func(user_query, company_list, dataframe_name)
+    return stock_info_responses[key]
+
+
+def _db_marker_path(db_path: str) -> str:
+    """Path of the JSON marker recording the company list and the date range the stock database was built with."""
+
+    return f'{os.path.splitext(db_path)[0]}_marker.json'
+
+
+def _db_is_fresh(db_path: str, company_list: List[str], start_date: datetime.date, end_date: datetime.date) -> bool:
+    """Check whether the stock database was built for the given company list and date range, and is unchanged since."""
+
+    marker_path = _db_marker_path(db_path)
+    if not os.path.isfile(db_path) or not os.path.isfile(marker_path):
+        return False
+
+    with open(marker_path, 'r') as marker_file:
+        marker = json.load(marker_file)
+
+    return (
+        marker['db_mtime_ns'] == os.stat(db_path).st_mtime_ns
+        and marker['company_list'] == company_list
+        and datetime.date.fromisoformat(marker['start_date']) <= start_date
+        and datetime.date.fromisoformat(marker['end_date']) >= end_date
+    )
+
+
+def _mark_db_fresh(db_path: str, company_list: List[str], start_date: datetime.date, end_date: datetime.date) -> None:
+    """Record the company list and the date range the stock database was built with."""
+
+    with open(_db_marker_path(db_path), 'w') as marker_file:
+        json.dump(
+            {
+                'db_mtime_ns': os.stat(db_path).st_mtime_ns,
+                'company_list': company_list,
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat(),
+            },
+            marker_file,
+        )
+
+
+def copy_session_values(session_values: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep copy the values of the session, skipping those that cannot be copied."""
+
+    copied_values: Dict[str, Any] = dict()
+    for key, value in session_values.items():
+        try:
+            copied_values[key] = copy.deepcopy(value)
+        except Exception:
+            logger.warning(f'Could not copy the session value `{key}`, which will not be restored before every test.')
+    return copied_values
+
+
+def with_llm_lock(test_method: Callable[[T], None]) -> Callable[[T], None]:
+    """
+    Decorator to run a test while holding `llm_lock`.
+
+    The `handle_*` methods set the tools of the LLM in the shared `streamlit.session_state`
+    before invoking it, so they must not interleave with each other when the tests run concurrently.
+    """
+
+    @functools.wraps(test_method)
+    def wrapper(self: T) -> None:
+        with llm_lock:
+            test_method(self)
+
+    return wrapper
+
 
 class FinancialAssistantTest(unittest.TestCase):
     """Test class for the Financial Assistant starter kit."""
 
     time_start: float
     time_end: float
+    session_template: Dict[str, Any]
+    llm: SambaNovaLLM
+    llm_cache: JSONLLMCache
+
+    # Expected key of the responses by company, and expected prefix of the company SQL tables
+    company_key: str = DEFAULT_COMPANY_NAME.upper()
+    table_prefix: str = f'{DEFAULT_COMPANY_NAME.lower()}_'
 
     @classmethod
     def setUpClass(cls: Type[T]) -> None:
-        """Records the start time of the tests."""
+        """Records the start time, initializes the session and the shared LLM, and installs the caches."""
 
         cls.time_start = time.time()
 
-    def setUp(self) -> None:
-        """Set up before every test."""
-
         # Initialize the session
         initialize_session(session_state=streamlit.session_state, prod_mode=False, cache_dir=TEST_CACHE_DIR)
 
@@ -85,9 +348,6 @@ class FinancialAssistantTest(unittest.TestCase):
         if 'SEC_API_EMAIL' not in streamlit.session_state or streamlit.session_state.SEC_API_EMAIL is None:
             streamlit.session_state.SEC_API_EMAIL = f'user_{streamlit.session_state.session_id}@sambanova_cloud.com'
 
-        # Initialize the LLM
-        streamlit.session_state.llm = SambaNovaLLM()
-
         # Create the cache and its main subdirectories
         subdirectories = [
             streamlit.session_state.source_dir,
@@ -96,20 +356,153 @@ class FinancialAssistantTest(unittest.TestCase):
         ]
         create_temp_dir_with_subdirs(streamlit.session_state.cache_dir, subdirectories)
 
+        # Delete the cache directory and its subdirectories once all the tests have run
+        cls.addClassCleanup(delete_temp_dir, temp_dir=TEST_CACHE_DIR, verbose=False)
+
+        # Save the initialized session as the template restored before every test, except the LLM set by `setUp`
+        cls.session_template = copy_session_values(
+            {key: value for key, value in streamlit.session_state.to_dict().items() if key != 'llm'}
+        )
+
+        # Initialize the LLM shared by all the tests
+        cls.llm = SambaNovaLLM()
+
+        # Wait for the LLM to be ready, probing it with a bounded exponential backoff
+        for attempt in range(LLM_READINESS_ATTEMPTS):
+            try:
+                cls.llm.llm.invoke('ping')
+                break
+            except Exception:
+                time.sleep(0.05 * 2**attempt)
+
+        # Load the persistent LLM cache and install it globally
+        cls.llm_cache = JSONLLMCache(TEST_LLM_CACHE_PATH, cls.llm.llm_info['temperature'])
+        set_llm_cache(cls.llm_cache)
+
+        # Cache the SEC EDGAR filings on disk
+        parse_filings_patcher = mock.patch.object(tools_filings, 'parse_filings', cached_parse_filings)
+        parse_filings_patcher.start()
+        cls.addClassCleanup(parse_filings_patcher.stop)
+
+        # Reuse the responses of the tool `get_stock_info` across tests
+        get_stock_info_patcher = mock.patch.object(get_stock_info, 'func', cached_get_stock_info)
+        get_stock_info_patcher.start()
+        cls.addClassCleanup(get_stock_info_patcher.stop)
+
+        # Cache the Yahoo Finance News pages, and only them, over HTTP
+        requests_cache.install_cache(
+            TEST_HTTP_CACHE_PATH,
+            expire_after=TEST_HTTP_CACHE_EXPIRE_AFTER,
+            allowable_methods=('GET',),
+            urls_expire_after={
+                'finance.yahoo.com/news/': TEST_HTTP_CACHE_EXPIRE_AFTER,
+                'finance.yahoo.com/quote/': TEST_HTTP_CACHE_EXPIRE_AFTER,
+                '*': requests_cache.DO_NOT_CACHE,
+            },
+        )
+
+    def setUp(self) -> None:
+        """Set up before every test."""
+
+        # Restore the session from a copy of the template, so that the tests do not mutate the template itself
+        streamlit.session_state.update(copy_session_values(type(self).session_template))
+
+        # Reset the LLM to the shared instance, as the `handle_*` methods replace it
+        with llm_lock:
+            streamlit.session_state.llm = type(self).llm
+
+        # Attribute the LLM generations to this test, and discard those left pending by a failed attempt of it
+        running_test_id.set(self.id())
+        type(self).llm_cache.discard()
+
         # List of available methods for database query
         self.method_list = ['text-to-SQL', 'PandasAI-SqliteConnector']
 
-        # Wait for the LLM to be ready
-        time.sleep(1)
-
     @classmethod
     def tearDownClass(cls: Type[T]) -> None:
-        """Calculates and logs the total time taken to run the tests."""
+        """Flushes the LLM caches, uninstalls the HTTP cache, and logs the total time taken to run the tests."""
+
+        # Persist and uninstall the LLM caches
+        cls.llm_cache.flush()
+        set_llm_cache(None)
+
+        # Uninstall the HTTP cache
+        requests_cache.uninstall_cache()
 
         cls.time_end = time.time()
         total_time = cls.time_end - cls.time_start
         logger.info(f'Total execution time: {total_time:.2f} seconds.')
 
+    @classmethod
+    def _ensure_stock_db(cls: Type[T]) -> None:
+        """Creates the stock database shared by the database query tests, unless a fresh one already exists on disk."""
+
+        # Serialize the creation of the database across threads and processes
+        with FileLock(TEST_STOCK_DB_LOCK_PATH):
+            db_path = streamlit.session_state.db_path
+            company_list = [DEFAULT_COMPANY_NAME]
+            if not _db_is_fresh(db_path, company_list, DEFAULT_START_DATE, DEFAULT_END_DATE):
+                create_stock_database.invoke(
+                    {
+                        'company_list': company_list,
+                        'start_date': DEFAULT_START_DATE,
+                        'end_date': DEFAULT_END_DATE,
+                    }
+                )
+                _mark_db_fresh(db_path, company_list, DEFAULT_START_DATE, DEFAULT_END_DATE)
+
+    def test_llm_cache(self) -> None:
+        """Test that the prompts rendered from the same template with different queries do not share a cache entry."""
+
+        # A standalone cache, so that the persistent LLM cache is left untouched
+        llm_cache = JSONLLMCache(os.path.join(TEST_CACHE_DIR, 'llm_cache_test.json'))
+
+        # Two prompts that only differ by the company name
+        template = 'What is the ticker symbol for {company}?\nFormat instructions: {format_instructions}'
+        format_instructions = 'Return the ticker symbol as a JSON object with the key `symbol`.'
+        prompt_meta = template.format(company='Meta', format_instructions=format_instructions)
+        prompt_apple = template.format(company='Apple', format_instructions=format_instructions)
+
+        # Cache the response to the first prompt, and commit it as if the test recording it had passed
+        llm_cache.update(prompt_meta, 'llm', [Generation(text='{"symbol": "META"}')])
+        llm_cache.commit()
+
+        # Check that only the first prompt is a cache hit
+        self.assertIsNone(llm_cache.lookup(prompt_apple, 'llm'))
+        cached_generations = llm_cache.lookup(prompt_meta, 'llm')
+        self.assertIsNotNone(cached_generations)
+        assert cached_generations is not None
+        self.assertEqual(cached_generations[0].text, '{"symbol": "META"}')
+
+    def test_llm_cache_parallel_chain(self) -> None:
+        """Test that the generations cached by the worker threads of a `RunnableParallel` chain are committed."""
+
+        # A standalone cache, so that the persistent LLM cache is left untouched
+        llm_cache = JSONLLMCache(os.path.join(TEST_CACHE_DIR, 'llm_cache_parallel_test.json'))
+
+        def cache_answer(prompt: str) -> str:
+            """Cache an answer to the prompt, as the LLM step of a chain does."""
+
+            answer = f'Answer to: {prompt}'
+            llm_cache.update(prompt, 'llm', [Generation(text=answer)])
+            return answer
+
+        # Run the steps of the chain in the thread pool of LangChain
+        prompts = ['What is the ticker symbol for Meta?', 'What is the ticker symbol for Apple?']
+        chain = RunnableParallel(
+            meta=RunnableLambda(lambda _: cache_answer(prompts[0])),
+            apple=RunnableLambda(lambda _: cache_answer(prompts[1])),
+        )
+        chain.invoke(dict())
+
+        # Commit the generations as if the test had passed, and check that both are cache hits
+        llm_cache.commit()
+        for prompt in prompts:
+            cached_generations = llm_cache.lookup(prompt, 'llm')
+            self.assertIsNotNone(cached_generations)
+            assert cached_generations is not None
+            self.assertEqual(cached_generations[0].text, f'Answer to: {prompt}')
+
     def test_get_stock_info(self) -> None:
         """Test for the tool `get_stock_info`."""
 
@@ -125,6 +518,7 @@ class FinancialAssistantTest(unittest.TestCase):
         # Check the response
         self.check_get_stock_info(response)
 
+    @with_llm_lock
     def test_handle_stock_query(self) -> None:
         """Test for `handle_stock_query`, i.e. function calling for the tool `get_stock_info`."""
 
@@ -158,6 +552,36 @@ class FinancialAssistantTest(unittest.TestCase):
         # Check the response
         self.check_get_historical_price(response)
 
+    def test_get_historical_price_batch(self) -> None:
+        """Test that the tool `get_historical_price` yields the same dates for a batch of companies as for one."""
+
+        # Invoke the tool for one company, and for a batch of two companies
+        single_response = get_historical_price.invoke(
+            {
+                'company_list': [DEFAULT_COMPANY_NAME],
+                'start_date': DEFAULT_START_DATE,
+                'end_date': DEFAULT_END_DATE,
+            }
+        )
+        batch_response = get_historical_price.invoke(
+            {
+                'company_list': [DEFAULT_COMPANY_NAME, 'Apple'],
+                'start_date': DEFAULT_START_DATE,
+                'end_date': DEFAULT_END_DATE,
+            }
+        )
+
+        # Check the responses
+        self.check_get_historical_price(single_response)
+        self.check_get_historical_price(batch_response)
+
+        # Check that the price history of the company has the same dates in both responses
+        symbol = single_response[2][0]
+        pandas.testing.assert_index_equal(
+            batch_response[1][symbol].dropna().index, single_response[1][symbol].dropna().index
+        )
+
+    @with_llm_lock
     def test_handle_stock_data_analysis(self) -> None:
         """Test for `handle_stock_data_analysis`, i.e. function calling for the tool `get_historical_price`."""
 
@@ -200,6 +624,7 @@ class FinancialAssistantTest(unittest.TestCase):
         # Check the response
         self.check_create_stock_database(response)
 
+    @with_llm_lock
     def test_handle_database_creation(self) -> None:
         """Test for `handle_database_creation`, i.e. function calling for the tool `create_stock_database`."""
 
@@ -216,14 +641,8 @@ class FinancialAssistantTest(unittest.TestCase):
     def test_query_stock_database(self) -> None:
         """Test for the tool `query_stock_database`."""
 
-        # Create the database
-        create_stock_database.invoke(
-            {
-                'company_list': [DEFAULT_COMPANY_NAME],
-                'start_date': DEFAULT_START_DATE,
-                'end_date': DEFAULT_END_DATE,
-            }
-        )
+        # Create the database, if not already created
+        self._ensure_stock_db()
 
         for method in self.method_list:
             # Invoke the tool to answer the user query
@@ -238,17 +657,12 @@ class FinancialAssistantTest(unittest.TestCase):
             # Check the response
             self.check_query_stock_database(response, method)
 
+    @with_llm_lock
     def test_handle_database_query(self) -> None:
         """Test for `handle_database_query`, i.e. function calling for the tool `query_stock_database`."""
 
-        # Create the database
-        create_stock_database.invoke(
-            {
-                'company_list': [DEFAULT_COMPANY_NAME],
-                'start_date': DEFAULT_START_DATE,
-                'end_date': DEFAULT_END_DATE,
-            }
-        )
+        # Create the database, if not already created
+        self._ensure_stock_db()
 
         # The user query
         query = DEFAULT_STOCK_QUERY
@@ -280,6 +694,7 @@ class FinancialAssistantTest(unittest.TestCase):
         # Check the response
         self.check_scrape_yahoo_finance_news(response, url_list)
 
+    @with_llm_lock
     def test_handle_yfinance_news(self) -> None:
         """Test for `handle_yfinance_news`, i.e. function calling for the tool `scrape_yahoo_finance_news`."""
 
@@ -315,6 +730,7 @@ class FinancialAssistantTest(unittest.TestCase):
         # Check the response
         self.check_retrieve_filings(response)
 
+    @with_llm_lock
     def test_handle_financial_filings(self) -> None:
         """Test for `handle_financial_filings`, i.e. function calling for the tool `retrieve_filings`"""
 
@@ -395,22 +811,18 @@ class FinancialAssistantTest(unittest.TestCase):
         # Check the response
         self.assertIsInstance(response, str)
 
-    def test_delete_cache(self) -> None:
-        """Delete the cache directory and its subdirectories."""
-
-        delete_temp_dir(temp_dir=TEST_CACHE_DIR, verbose=False)
-
     def check_get_stock_info(self, response: Dict[str, str]) -> None:
         """Check the response of the tool `get_stock_info`."""
 
         # Assert that the response is a dictionary
         self.assertIsInstance(response, dict)
         # Assert that the response contains the expected keys
-        self.assertIn(DEFAULT_COMPANY_NAME.upper(), response)
+        self.assertIn(self.company_key, response)
+        value = response[self.company_key]
         # Assert that the response is a string
-        self.assertIsInstance(response[DEFAULT_COMPANY_NAME.upper()], str)
+        self.assertIsInstance(value, str)
         # Assert that the response is a png file
-        self.assertTrue(response[DEFAULT_COMPANY_NAME.upper()].endswith('.png'))
+        self.assertTrue(value.endswith('.png'))
 
     def check_get_historical_price(self, response: Tuple[pandas.DataFrame, Figure, List[str]]) -> None:
         """Check the response of the tool `get_historical_prices`."""
@@ -427,8 +839,7 @@ class FinancialAssistantTest(unittest.TestCase):
 
         # Assert that the third element of the tuple is a list of strings
         self.assertIsInstance(response[2], list)
-        for item in response[2]:
-            self.assertIsInstance(item, str)
+        self.assertTrue(all(isinstance(item, str) for item in response[2]))
 
     def check_create_stock_database(self, response: Dict[str, List[str]]) -> None:
         """Check the response of the tool `create_stock_database`."""
@@ -437,15 +848,16 @@ class FinancialAssistantTest(unittest.TestCase):
         self.assertIsInstance(response, dict)
 
         # Assert that the response contains the expected keys
-        self.assertListEqual(list(response), [DEFAULT_COMPANY_NAME.upper()])
+        self.assertListEqual(list(response), [self.company_key])
+        tables = response[self.company_key]
 
         # Assert that the response contains the expected values
-        self.assertIsInstance(response[DEFAULT_COMPANY_NAME.upper()], list)
+        self.assertIsInstance(tables, list)
 
         # Assert that each value of the list of tables is a string that starts with the expected prefix
-        for table in response[DEFAULT_COMPANY_NAME.upper()]:
+        for table in tables:
             self.assertIsInstance(table, str)
-            self.assertTrue(table.startswith(f'{DEFAULT_COMPANY_NAME.lower()}_'))
+            self.assertTrue(table.startswith(self.table_prefix))
 
     def check_query_stock_database(self, response: Any, method: str = 'text-to-SQL') -> None:
         """Check the response of the tool `query_stock_database`."""
@@ -459,11 +871,12 @@ class FinancialAssistantTest(unittest.TestCase):
             self.assertIsInstance(response, dict)
 
             # Assert that the response contains the expected keys
-            self.assertListEqual(list(response), [DEFAULT_COMPANY_NAME.upper()])
+            self.assertListEqual(list(response), [self.company_key])
+            items = response[self.company_key]
 
             # Assert that the response contains the expected values
-            self.assertIsInstance(response[DEFAULT_COMPANY_NAME.upper()], list)
-            for item in response[DEFAULT_COMPANY_NAME.upper()]:
+            self.assertIsInstance(items, list)
+            for item in items:
                 self.assertIsInstance(item, str)
                 self.assertTrue(item.endswith('.png'))
         else:
@@ -477,9 +890,8 @@ class FinancialAssistantTest(unittest.TestCase):
 
         # Assert that `url_list` is a list of strings that are all URLs
         self.assertIsInstance(url_list, list)
-        for url in url_list:
-            self.assertIsInstance(url, str)
-            self.assertTrue(url.startswith('https://'))
+        self.assertTrue(all(isinstance(url, str) for url in url_list))
+        self.assertTrue(numpy.char.startswith(numpy.asarray(url_list, dtype=str), 'https://').all())
 
     def check_retrieve_filings(self, response: Dict[str, str]) -> None:
         """Check the response of the tool `retrieve_filings`."""
@@ -488,10 +900,23 @@ class FinancialAssistantTest(unittest.TestCase):
         self.assertIsInstance(response, dict)
 
         # Assert that the response contains the expected keys
-        self.assertEqual(list(response), [DEFAULT_COMPANY_NAME.upper()])
+        self.assertEqual(list(response), [self.company_key])
 
         # Assert that the response contains the expected values
-        self.assertIsInstance(response[DEFAULT_COMPANY_NAME.upper()], str)
+        self.assertIsInstance(response[self.company_key], str)
+
+
+class _RequiredResultRecord(TypedDict):
+    """Required fields of the record of a test result."""
+
+    name: str
+    status: str
+
+
+class ResultRecord(_RequiredResultRecord, total=False):
+    """Record of a test result, with the message of the failure or error, if any."""
+
+    message: str
 
 
 class CustomTextTestResult(unittest.TextTestResult):
@@ -506,8 +931,12 @@ class CustomTextTestResult(unittest.TextTestResult):
 
         super().__init__(stream, descriptions, verbosity)
 
-        # Initialize the list of test results and the list of successes
-        self.results_list: List[Dict[str, Any]] = list()
+        # Initialize the test results, stored as parallel lists of names, statuses, and messages
+        self.names: List[str] = list()
+        self.statuses: List[str] = list()
+        self.messages: List[Optional[str]] = list()
+
+        # Initialize the list of successes
         self.successes: List[unittest.TestCase] = list()
 
         # Set the number of retries: 1 means run failed or errored tests twice
@@ -516,22 +945,66 @@ class CustomTextTestResult(unittest.TextTestResult):
         # Initialize the global retry count
         self.global_retry_count: int = 0
 
+        # Lock guarding the bookkeeping of the results, which are reported from concurrent threads
+        self._lock = threading.RLock()
+
+    @property
+    def results_list(self) -> List[ResultRecord]:
+        """The test results as a list of records, each with a name, a status, and optionally a message."""
+
+        results_list: List[ResultRecord] = list()
+        for name, status, message in zip(self.names, self.statuses, self.messages):
+            result: ResultRecord = {'name': name, 'status': status}
+            if message is not None:
+                result['message'] = message
+            results_list.append(result)
+        return results_list
+
+    def _record(self, test: unittest.TestCase, status: str, message: Optional[str] = None) -> None:
+        """Appends the result of a test case, or of a class fixture."""
+
+        self.names.append(getattr(test, '_testMethodName', str(test)))
+        self.statuses.append(status)
+        self.messages.append(message)
+
     def _initialize_retry(self, test: unittest.TestCase) -> None:
         """Initialize the retry count for the given test case."""
 
         if not hasattr(test, 'retry'):
             setattr(test, 'retry', self.max_retry)
 
-    def _sleep(self) -> None:
-        """Wait for the given number of seconds before continuing with the next test run."""
+    def _sleep(self, test: unittest.TestCase, err: Any) -> None:
+        """
+        Wait before retrying the given test case, following an exponential backoff with jitter.
+
+        The wait time doubles with each attempt of the test case, and doubles again for rate-limited requests.
+        It is capped at `RETRY_SLEEP_TIME` seconds.
+        """
+
+        # Number of attempts of this test case that have already been retried
+        attempt = self.max_retry - getattr(test, 'retry', self.max_retry)
+
+        delay = 2**attempt + random.random() * RETRY_JITTER
+
+        # Wait longer when the failure was caused by rate limiting
+        message = str(err[1])
+        if '429' in message or 'Too Many Requests' in message:
+            delay *= 2
 
-        time.sleep(RETRY_SLEEP_TIME)
+        time.sleep(min(delay, RETRY_SLEEP_TIME))
 
     def startTest(self, test: unittest.TestCase) -> None:
         """Start a test case."""
 
         logger.info(f'Running test {test._testMethodName}.')
-        super().startTest(test)
+        with self._lock:
+            super().startTest(test)
+
+    def stopTest(self, test: unittest.TestCase) -> None:
+        """Stop a test case."""
+
+        with self._lock:
+            super().stopTest(test)
 
     def addSuccess(self, test: unittest.TestCase) -> None:
         """Logs a passed test."""
@@ -539,12 +1012,17 @@ class CustomTextTestResult(unittest.TextTestResult):
         # Initialize the retry count for this test case
         self._initialize_retry(test)
 
-        # Add the test to the list of successful tests
-        super().addSuccess(test)
+        # Keep the LLM generations recorded by the passed test
+        if isinstance(test, FinancialAssistantTest):
+            test.llm_cache.commit()
+
+        with self._lock:
+            # Add the test to the list of successful tests
+            super().addSuccess(test)
 
-        # Append to the list of successful tests
-        self.successes.append(test)
-        self.results_list.append({'name': test._testMethodName, 'status': 'PASSED'})
+            # Append to the list of successful tests
+            self.successes.append(test)
+            self._record(test, 'PASSED')
 
         # Log the retry status for this test case
         if getattr(test, 'retry', self.max_retry) < self.max_retry:
@@ -562,7 +1040,7 @@ class CustomTextTestResult(unittest.TextTestResult):
             logger.warning(f'Retrying {test._testMethodName} after failure.')
 
             # Wait
-            self._sleep()
+            self._sleep(test, err)
 
             # Retrieve the retry count for this test case
             retry = getattr(test, 'retry')
@@ -571,16 +1049,18 @@ class CustomTextTestResult(unittest.TextTestResult):
             setattr(test, 'retry', retry - 1)
 
             # Increase the global retry count
-            self.global_retry_count += 1
+            with self._lock:
+                self.global_retry_count += 1
 
             # Run the test case again
             test.run(self)
         else:
-            # Add the test to the list of failed tests
-            super().addFailure(test, err)
+            with self._lock:
+                # Add the test to the list of failed tests
+                super().addFailure(test, err)
 
-            # Append to the list of failed tests
-            self.results_list.append({'name': test._testMethodName, 'status': 'FAILED', 'message': str(err[1])})
+                # Append to the list of failed tests
+                self._record(test, 'FAILED', str(err[1]))
 
     def addError(self, test: unittest.TestCase, err: Any) -> None:
         """Logs a test with errors."""
@@ -592,7 +1072,7 @@ class CustomTextTestResult(unittest.TextTestResult):
             logger.warning(f'Retrying {test._testMethodName} after error.')
 
             # Wait
-            self._sleep()
+            self._sleep(test, err)
 
             # Retrieve the retry count for this test case
             retry = getattr(test, 'retry')
@@ -601,47 +1081,123 @@ class CustomTextTestResult(unittest.TextTestResult):
             setattr(test, 'retry', retry - 1)
 
             # Increase the global retry count
-            self.global_retry_count += 1
+            with self._lock:
+                self.global_retry_count += 1
 
             # Run the test case again
             test.run(self)
         else:
-            # Add the test to the list of errored tests
-            super().addError(test, err)
+            with self._lock:
+                # Add the test to the list of errored tests
+                super().addError(test, err)
+
+                # Append to the list of errored tests
+                self._record(test, 'ERROR', str(err[1]))
+
+
+class ConcurrentTestSuite(unittest.TestSuite):
+    """
+    Test suite running groups of dependent tests concurrently.
+
+    The tests within a group run sequentially, while the groups run concurrently in a thread pool.
+    The tests of the final group depend on all the other groups and run once they have all completed.
+    The class fixtures are handled here, once, instead of by each group.
+    """
+
+    def __init__(
+        self,
+        test_class: Type[unittest.TestCase],
+        concurrent_groups: List[List[str]],
+        final_group: List[str],
+        max_workers: int = MAX_TEST_WORKERS,
+    ) -> None:
+        """
+        Args:
+            test_class: The test class of all the tests.
+            concurrent_groups: The groups of test names that can run concurrently to each other.
+            final_group: The test names to run after all the concurrent groups.
+            max_workers: The maximum number of groups running concurrently.
+                Defaults to `MAX_TEST_WORKERS`.
+        """
+        self.test_class = test_class
+        # The groups do not handle the class fixtures, unlike `unittest.TestSuite`
+        self.concurrent_groups = [
+            unittest.BaseTestSuite([test_class(test_name) for test_name in group]) for group in concurrent_groups
+        ]
+        self.final_group = unittest.BaseTestSuite([test_class(test_name) for test_name in final_group])
+        self.max_workers = max_workers
+        super().__init__(test for group in self.concurrent_groups + [self.final_group] for test in group)
 
-            # Append to the list of errored tests
-            self.results_list.append({'name': test._testMethodName, 'status': 'ERROR', 'message': str(err[1])})
+    def _add_class_error(self, result: unittest.TestResult, method_name: str, err: Any) -> None:
+        """Report an error raised by a class fixture, as `unittest.TestSuite` does, without retrying it."""
+
+        error_holder = unittest.suite._ErrorHolder(  # type: ignore[attr-defined]
+            f'{method_name} ({self.test_class.__module__}.{self.test_class.__qualname__})'
+        )
+        setattr(error_holder, 'retry', 0)
+        result.addError(error_holder, err)
+
+    def _do_class_cleanups(self, result: unittest.TestResult) -> None:
+        """Run the class cleanups, and report their errors."""
+
+        self.test_class.doClassCleanups()
+        for err in getattr(self.test_class, 'tearDown_exceptions', list()):
+            self._add_class_error(result, 'doClassCleanups', err)
+
+    def run(self, result: unittest.TestResult, debug: bool = False) -> unittest.TestResult:
+        """Run the class fixtures, the concurrent groups, and then the final group."""
+
+        # Skip the tests if the class setup fails
+        try:
+            self.test_class.setUpClass()
+        except Exception:
+            self._add_class_error(result, 'setUpClass', sys.exc_info())
+            self._do_class_cleanups(result)
+            return result
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Consume the iterator to propagate any exception raised by a group
+                list(executor.map(lambda group: group.run(result), self.concurrent_groups))
+            self.final_group.run(result)
+        finally:
+            try:
+                self.test_class.tearDownClass()
+            except Exception:
+                self._add_class_error(result, 'tearDownClass', sys.exc_info())
+            self._do_class_cleanups(result)
+
+        return result
 
 
 def suite() -> unittest.TestSuite:
     """Test suite to define the order of the test execution."""
 
-    # List all the test cases here in order of execution
-    suite_list = [
-        'test_get_stock_info',
-        'test_handle_stock_query',
-        'test_get_historical_price',
-        'test_handle_stock_data_analysis',
-        'test_create_stock_database',
-        'test_handle_database_creation',
-        'test_query_stock_database',
-        'test_handle_database_query',
-        'test_scrape_yahoo_finance_news',
-        'test_handle_yfinance_news',
-        'test_retrieve_filings',
-        'test_handle_financial_filings',
+    # List the groups of dependent test cases here, in order of execution within each group
+    concurrent_groups = [
+        ['test_llm_cache', 'test_llm_cache_parallel_chain'],
+        # The PandasAI charts of the stock info and the database queries are drawn with the global `pyplot` state
+        [
+            'test_get_stock_info',
+            'test_handle_stock_query',
+            'test_create_stock_database',
+            'test_handle_database_creation',
+            'test_query_stock_database',
+            'test_handle_database_query',
+        ],
+        ['test_get_historical_price', 'test_get_historical_price_batch', 'test_handle_stock_data_analysis'],
+        ['test_scrape_yahoo_finance_news', 'test_handle_yfinance_news'],
+        ['test_retrieve_filings', 'test_handle_financial_filings'],
+    ]
+
+    # List the test cases that depend on the outputs of all the groups, in order of execution
+    final_group = [
         'test_handle_pdf_generation',
         'test_pdf_rag',
         'test_handle_pdf_rag',
-        'test_delete_cache',
     ]
 
-    # Add all the tests to the suite
-    suite = unittest.TestSuite()
-    for suite_item in suite_list:
-        suite.addTest(FinancialAssistantTest(suite_item))
-
-    return suite
+    return ConcurrentTestSuite(FinancialAssistantTest, concurrent_groups, final_group)
 
 
 def main() -> int:
@@ -656,17 +1212,19 @@ def main() -> int:
 
     logger.info('Test Results:')
 
-    assert hasattr(test_results, 'results_list'), 'The test results does not have the attribute `results_list`.'
+    assert hasattr(test_results, 'names'), 'The test results does not have the attribute `names`.'
+    assert hasattr(test_results, 'statuses'), 'The test results does not have the attribute `statuses`.'
+    assert hasattr(test_results, 'messages'), 'The test results does not have the attribute `messages`.'
     assert hasattr(
         test_results, 'global_retry_count'
     ), 'The test results does not have the attribute `global_retry_count`.'
     assert hasattr(test_results, 'successes'), 'The test results does not have the attribute `successes`.'
 
     # Log results for each test
-    for result in test_results.results_list:
-        logger.info(f"{result['name']}: {result['status']}")
-        if 'message' in result:
-            logger.warning(f"  Message: {result['message']}")
+    for name, status, message in zip(test_results.names, test_results.statuses, test_results.messages):
+        logger.info(f'{name}: {status}')
+        if message is not None:
+            logger.warning(f'  Message: {message}')
 
     # Log the number of tests that passed and failed: successes, failures, and errors
     failed_tests = len(test_results.failures) + len(test_results.errors)